@@ -36,17 +36,23 @@
 ####### IMPORTS #######
 #######################
 
+import copy
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 sys.path.append(Path(__file__).parent.as_posix())
 from autopkglib import ProcessorError  # noqa: E402
 from helpers.configs import Configurator  # noqa: E402
-from helpers.utils import Utilities  # noqa: E402
+from helpers.utils import Utilities, _StreamedMultipart  # noqa: E402
 
 __all__ = ["KAPPA"]
 
+# Resolved once at import; constant for the process lifetime
+_SCRIPT_PATH = Path(__file__).resolve()
+_PARENT_DIR = _SCRIPT_PATH.parent
+
 
 class KAPPA(Configurator, Utilities):
     description = (
@@ -95,66 +101,80 @@ class KAPPA(Configurator, Utilities):
         def _generate_s3_req():
             """Generates an S3 presigned URL to upload a PKG"""
             post_url = self.api_upload_pkg_url
-            form_data = f"-F 'name={self.pkg_name}'"
+            form_data = {"name": self.pkg_name}
             status_code, response = self._curl_cmd_exec(method="POST", url=post_url, files=form_data)
             return self._validate_curl_response(status_code, response, "presign")
 
         if not _generate_s3_req():
             return False
-        # Ugly way to shell-ify our JSON resp for curl form data
-        s3_data = (
-            str(self.s3_generated_req.get("post_data"))
-            .replace("{", "-F ")
-            .replace("': '", "=")
-            .replace("', '", "' -F '")
-            .replace("}", "")
-        )
-        # Append PKG path to form data
-        s3_data = s3_data + f" -F 'file=@{self.pkg_path}'"
+        # Build multipart form fields directly from the presign response
+        s3_data = dict(self.s3_generated_req.get("post_data"))
         upload_url = self.s3_generated_req.get("post_url")
         self.s3_key = self.s3_generated_req.get("file_key")
         if self.dry_run is True:
-            self.output(f"DRY RUN: Would upload PKG '{self.pkg_path} cURL POST to '{upload_url}'")
+            self.output(f"DRY RUN: Would upload PKG '{self.pkg_path} HTTP POST to '{upload_url}'")
             return True
         self.output(f"Beginning file upload of {self.pkg_name}...")
-        status_code, response = self._curl_cmd_exec(method="POST", url=upload_url, files=s3_data)
+        # Stream the PKG from disk via a file-like multipart body; requests sends
+        # read()-able bodies in fixed-size chunks, so a multi-GB PKG is never
+        # assembled in memory (Content-Length is precomputed — S3 rejects chunked)
+        upload_body = _StreamedMultipart(s3_data, self.pkg_name, self.pkg_path)
+        try:
+            status_code, response = self._curl_cmd_exec(
+                method="POST", url=upload_url, data=upload_body, headers={"Content-Type": upload_body.content_type}
+            )
+        finally:
+            upload_body.close()
         return self._validate_curl_response(status_code, response, "upload")
 
     def create_custom_app(self):
         """Assigns creation data and POST URL to vars for cURL execution
         Runs command and validates output when returning self._validate_curl_response()"""
-        create_data = f"-F 'name={self.custom_app_name}' -F 'file_key={self.s3_key}' -F 'install_type=package' -F 'install_enforcement={self.custom_app_enforcement}'"
+        create_data = {
+            "name": self.custom_app_name,
+            "file_key": self.s3_key,
+            "install_type": "package",
+            "install_enforcement": self.custom_app_enforcement,
+        }
         if self.custom_app_enforcement == "continuously_enforce":
-            create_data += f" -F 'audit_script=<{self.audit_script_path}'"
+            create_data["audit_script"] = self._audit_script_read()
         elif self.custom_app_enforcement == "no_enforcement":
+            create_data["show_in_self_service"] = "true"
             if self.test_app is True:
-                create_data += f" -F 'show_in_self_service=true' -F 'self_service_category_id={self.test_category_id}'"
+                create_data["self_service_category_id"] = self.test_category_id
             else:
-                create_data += f" -F 'show_in_self_service=true' -F 'self_service_category_id={self.ss_category_id}'"
+                create_data["self_service_category_id"] = self.ss_category_id
         post_url = self.api_custom_apps_url
         if self.dry_run is True:
+            # Redact the full audit script body from the log — path alone is plenty
+            log_data = (
+                {**create_data, "audit_script": f"<contents of {self.audit_script_path}>"}
+                if "audit_script" in create_data
+                else create_data
+            )
             self.output(
-                f"DRY RUN: Would create Custom App '{self.custom_app_name}' with cURL POST to '{post_url}' and fields '{create_data}'"
+                f"DRY RUN: Would create Custom App '{self.custom_app_name}' with HTTP POST to '{post_url}' and fields '{log_data}'"
             )
             return True
         status_code, response = self._curl_cmd_exec(method="POST", url=post_url, files=create_data)
         return self._validate_curl_response(status_code, response, "create")
 
+    def get_custom_apps(self):
+        """Queries all custom apps from Kandji tenant; assigns GET URL to var for cURL execution
+        Runs command and validates output when returning self._validate_curl_response()"""
+        get_url = self.api_custom_apps_url
+        status_code, response = self._curl_cmd_exec(url=get_url)
+        return self._validate_curl_response(status_code, response, "get")
+
     def update_custom_app(self):
         """Assigns update data and PATCH URL to vars for cURL execution
         Runs command and validates output when returning self._validate_curl_response()"""
-
-        # Assign self.custom_apps
-        def get_custom_apps():
-            """Queries all custom apps from Kandji tenant; assigns GET URL to var for cURL execution
-            Runs command and validates output when returning self._validate_curl_response()"""
-            get_url = self.api_custom_apps_url
-            status_code, response = self._curl_cmd_exec(url=get_url)
-            return self._validate_curl_response(status_code, response, "get")
-
-        # Raise if our custom apps GET fails
-        if not get_custom_apps():
-            raise ProcessorError
+        # Custom apps list cannot change mid-run, so fetch once and reuse
+        # (main() prepopulates; this covers direct invocations and 503 retries)
+        if not hasattr(self, "custom_apps"):
+            # Raise if our custom apps GET fails
+            if not self.get_custom_apps():
+                raise ProcessorError
 
         if self.custom_app_name is not None:
             lib_item_dict = self._find_lib_item_match()
@@ -171,7 +191,7 @@ class KAPPA(Configurator, Utilities):
                 self.output("ERROR: Auto-create is disabled — skipping remaining steps")
                 return False
 
-        update_data = f"-F 'file_key={self.s3_key}'"
+        update_data = {"file_key": self.s3_key}
 
         # Assign existing LI UUID and enforcement
         lib_item_uuid = lib_item_dict.get("id")
@@ -193,11 +213,17 @@ class KAPPA(Configurator, Utilities):
                 # Call audit customization here since not invoked earlier
                 self._customize_audit_for_upload()
                 self.custom_app_enforcement = lib_item_enforcement
-            update_data += f" -F 'audit_script=<{self.audit_script_path}'"
-        patch_url = os.path.join(self.api_custom_apps_url, lib_item_uuid)
+            update_data["audit_script"] = self._audit_script_read()
+        patch_url = f"{self.api_custom_apps_url}/{lib_item_uuid}"
         if self.dry_run is True:
+            # Redact the full audit script body from the log — path alone is plenty
+            log_data = (
+                {**update_data, "audit_script": f"<contents of {self.audit_script_path}>"}
+                if "audit_script" in update_data
+                else update_data
+            )
             self.output(
-                f"DRY RUN: Would update Custom App '{self.custom_app_name}' with cURL PATCH to '{patch_url}' and fields '{update_data}'"
+                f"DRY RUN: Would update Custom App '{self.custom_app_name}' with HTTP PATCH to '{patch_url}' and fields '{log_data}'"
             )
             return True
         status_code, response = self._curl_cmd_exec(method="PATCH", url=patch_url, files=update_data)
@@ -206,8 +232,8 @@ class KAPPA(Configurator, Utilities):
     def kandji_customize_create_update(self):
         """Parent function to process any audit script updates and
         either create a net new or update an existing custom app"""
-        # Properly escape any single quotes in app name
-        self.custom_app_name = self.custom_app_name.replace(r"'", r"'\''")
+        # Fresh 503 retry budget per create/update pass (test and prod each get their own)
+        self._retry_count = 0
         self._customize_audit_for_upload() if self.custom_app_enforcement == "continuously_enforce" else True
         if self.recipe_create_new is True:
             self.create_custom_app()
@@ -219,35 +245,72 @@ class KAPPA(Configurator, Utilities):
         """Main function to execute KAPPA"""
         # Define our variables from recipe input
         # Report var assignments to AutoPKG output
-        script_path = Path(__file__).resolve()
-        # Capture exec dir path
-        self.parent_dir = script_path.parent
+        # Capture exec dir path (resolved at import)
+        self.parent_dir = _PARENT_DIR
 
         # Reads config and assigns needed vars for runtime
         # Also validates and populates values for Kandji/Slack (if defined)
         self.populate_from_config()
         self.audit_script_path = os.path.join(self.parent_dir, self.audit_script)
+        expand_future = None
         if self.custom_app_enforcement == "continuously_enforce":
             if (self.app_name is None and self.bundle_id is None) or self.app_vers is None:
                 # This info is needed for auditing/enforcement, so split the PKG and find it
-                self._expand_pkg_get_info()
+                # Expansion is disk/CPU-bound and independent of the presign + upload
+                # round-trips, so run it in a worker thread overlapping the network phase
+                expand_pool = ThreadPoolExecutor(max_workers=1)
+                expand_future = expand_pool.submit(self._expand_pkg_get_info)
+                expand_pool.shutdown(wait=False)
 
         ###################
         #### MAIN EXEC ####
         ###################
-        if self.upload_custom_app() is True:
-            # Iterate over dict specifying app type and name
-            for key, value in self.app_names.items():
+        upload_succeeded = self.upload_custom_app()
+        # App/PKG info must be in place before any audit customization below
+        if expand_future is not None:
+            expand_future.result()
+        if upload_succeeded is True:
+            # Fetch all custom apps once up front; shared across test/prod passes
+            # Create-only runs never consult existing apps, so skip the GET there
+            # (the hasattr guard in update_custom_app covers any stragglers)
+            if self.recipe_create_new is not True:
+                # Raise if our custom apps GET fails
+                if not self.get_custom_apps():
+                    raise ProcessorError
+
+            def _process_app_name(key, value):
+                """Processes a single app type/name pair on a shallow copy of self
+                Copy keeps per-env name/type state task-local; the underlying
+                requests.Session and custom apps list are shared and thread-safe"""
+                task = copy.copy(self)
                 if key == "test_name":
-                    self.custom_app_name = value
-                    self.test_app, self.prod_app = True, False
+                    task.custom_app_name = value
+                    task.test_app, task.prod_app = True, False
                 elif key == "prod_name":
-                    self.custom_app_name = value
-                    self.test_app, self.prod_app = False, True
+                    task.custom_app_name = value
+                    task.test_app, task.prod_app = False, True
                 else:
-                    self.test_app, self.prod_app = False, False
+                    task.test_app, task.prod_app = False, False
                 # Main func for processing Cr/Up ops
-                self.kandji_customize_create_update()
+                task.kandji_customize_create_update()
+
+            app_name_items = list(self.app_names.items())
+            # Audit enforcement rewrites the shared audit script on disk per env, so must run serially
+            # Update runs can also defer to an existing continuously_enforce library item and
+            # rewrite the script mid-flow, so stay serial if any fetched app enforces that way
+            audit_untouched = self.custom_app_enforcement != "continuously_enforce"
+            if audit_untouched and self.recipe_create_new is not True:
+                audit_untouched = not any(
+                    app.get("install_enforcement") == "continuously_enforce" for app in self.custom_apps
+                )
+            if len(app_name_items) > 1 and audit_untouched:
+                # Independent network ops, so run test/prod concurrently
+                with ThreadPoolExecutor(max_workers=len(app_name_items)) as pool:
+                    for task_future in [pool.submit(_process_app_name, key, value) for key, value in app_name_items]:
+                        task_future.result()
+            else:
+                for key, value in app_name_items:
+                    _process_app_name(key, value)
 
 
 ##############
@@ -31,9 +31,23 @@
 
 import json
 import os
+import time
+from pathlib import Path
 
 from autopkglib import Processor, ProcessorError
 
+# On-disk cache shared across AutoPkg runs (categories, tenant probe)
+_CACHE_DIR = Path.home() / ".cache" / "kappa"
+
+# Translation table between config enforcement values and API-valid values (both directions)
+_ENFORCEMENT_MAP = {
+    "audit_enforce": "continuously_enforce",
+    "self_service": "no_enforcement",
+    "continuously_enforce": "audit_enforce",
+    "no_enforcement": "self_service",
+    "install_once": "install_once",
+}
+
 
 class Configurator(Processor):
     """Reads and sets variables based on configured settings"""
@@ -44,20 +58,31 @@ class Configurator(Processor):
 
     def _parse_enforcement(self, enforcement):
         """Translates provided enforcement val between config values and API-valid values"""
-        match enforcement.lower():
-            case "audit_enforce":
-                parsed_enforcer = "continuously_enforce"
-            case "self_service":
-                parsed_enforcer = "no_enforcement"
-            case "continuously_enforce":
-                parsed_enforcer = "audit_enforce"
-            case "no_enforcement":
-                parsed_enforcer = "self_service"
-            case "install_once":
-                parsed_enforcer = "install_once"
-            case _:
-                return False
-        return parsed_enforcer
+        return _ENFORCEMENT_MAP.get(enforcement.lower(), False)
+
+    def _disk_cache_read(self, cache_name, expire):
+        """Reads JSON payload `cache_name` from the KAPPA cache dir
+        Returns the payload if present, valid, and younger than `expire` seconds
+        Keyed on the configured Kandji API URL; returns None on any miss"""
+        cache_path = _CACHE_DIR / f"{cache_name}.json"
+        try:
+            if time.time() - cache_path.stat().st_mtime < expire:
+                payload = json.loads(cache_path.read_text())
+                if payload.get("url") == self.kandji_api_url:
+                    return payload
+        except (OSError, ValueError):
+            pass
+        return None
+
+    def _disk_cache_write(self, cache_name, data=None):
+        """Persists `data` to `cache_name` in the KAPPA cache dir
+        Stores the Kandji API URL alongside so stale tenants never match
+        Cache misses are best-effort; failures fall back to live queries"""
+        try:
+            _CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            (_CACHE_DIR / f"{cache_name}.json").write_text(json.dumps({"url": self.kandji_api_url, "data": data}))
+        except OSError:
+            pass
 
     def _read_config(self, kandji_conf):
         """Read in configuration from defined conf path
@@ -65,12 +90,13 @@ class Configurator(Processor):
         Return loaded JSON data once existence and validity are confirmed"""
         # Have to derive path this way in order to get the execution file origin
         kandji_conf_path = os.path.join(self.parent_dir, kandji_conf)
-        if not os.path.exists(kandji_conf_path):
-            self.output(f"ERROR: KAPPA config not found at {kandji_conf_path}! Validate its existence and try again")
-            return False
+        # EAFP: open directly rather than stat-ing first (one syscall, no TOCTOU race)
         try:
             with open(kandji_conf_path) as f:
-                custom_config = json.loads(f.read())
+                custom_config = json.load(f)
+        except FileNotFoundError:
+            self.output(f"ERROR: KAPPA config not found at {kandji_conf_path}! Validate its existence and try again")
+            return False
         except ValueError as ve:
             self.output(
                 f"ERROR: Config at {kandji_conf_path} is not valid JSON!\n{ve} — validate file integrity for {kandji_conf} and try again"
@@ -125,11 +151,8 @@ class Configurator(Processor):
             if self.recipe_map is False:
                 self.output("ERROR: Recipe map is enabled, but config is invalid!")
                 raise ProcessorError("ERROR: Recipe map is enabled, but config is invalid!")
-            for recipe, apps in self.recipe_map.items():
-                # Once matching recipe found, assign and exit loop
-                if recipe in self.recipe_name:
-                    self.app_names = apps
-                    break
+            # Single scan with early exit on first matching recipe substring
+            self.app_names = next((apps for recipe, apps in self.recipe_map.items() if recipe in self.recipe_name), {})
             if not self.app_names:
                 self.output(f"WARNING: Recipe map enabled, but no match found for recipe '{self.recipe_name}'!")
                 self.output("Will use defaults if no in-recipe values set")
@@ -139,14 +162,8 @@ class Configurator(Processor):
 
         # Once assigned, remove from dict
         # This ensures we're only iterating over app names
-        try:
-            self.app_names.pop("ss_category")
-        except KeyError:
-            pass
-        try:
-            self.app_names.pop("test_category")
-        except KeyError:
-            pass
+        self.app_names.pop("ss_category", None)
+        self.app_names.pop("test_category", None)
 
     def _set_defaults_enforcements(self):
         """Reads JSON config and sets enforcement based on
@@ -156,6 +173,7 @@ class Configurator(Processor):
             self.default_custom_name = default_vals.get("new_app_naming")
             self.default_dry_run = default_vals.get("dry_run")
             self.default_dynamic_lookup = default_vals.get("dynamic_lookup")
+            self.default_pkg_expand_dir = default_vals.get("pkg_expand_dir")
             self.default_ss_category = default_vals.get("self_service_category")
             self.test_default_ss_category = default_vals.get("test_self_service_category")
 
@@ -199,10 +217,18 @@ class Configurator(Processor):
     def _populate_self_service(self):
         def get_self_service():
             """Queries all Self Service categories from Kandji tenant; assigns GET URL to var for cURL execution
+            Categories change rarely, so responses are disk-cached for an hour across AutoPkg runs
             Runs command and validates output when returning self._validate_curl_response()"""
+            cached = self._disk_cache_read("self_service", expire=3600)
+            if cached is not None:
+                self.self_service = cached.get("data")
+                return True
             get_url = f"{self.kandji_api_prefix}/self-service/categories"
             status_code, response = self._curl_cmd_exec(url=get_url)
-            return self._validate_curl_response(status_code, response, "get_selfservice")
+            validated = self._validate_curl_response(status_code, response, "get_selfservice")
+            if validated is True:
+                self._disk_cache_write("self_service", self.self_service)
+            return validated
 
         def name_to_id(ss_name, ss_type):
             """Iterates over self_service list and assigns category ID to var"""
@@ -214,24 +240,15 @@ class Configurator(Processor):
                 if ss_type == "test"
                 else None
             )
-            try:
-                ss_assignment = next(
-                    category.get("id") for category in self.self_service if category.get("name") == ss_name
-                )
-            except StopIteration:
+            ss_assignment = self._ss_by_name.get(ss_name)
+            if ss_assignment is None:
                 self.output(
                     f"WARNING: Provided category '{ss_name}' not found in Self Service!"
                 ) if ss_name is not None else None
-                try:
-                    # Set category id to default (None check performed later)
-                    ss_assignment = (
-                        next(category.get("id") for category in self.self_service if category.get("name") == ss_default)
-                        if ss_default
-                        else None
-                    )
-                except StopIteration:
+                # Set category id to default (None check performed later)
+                ss_assignment = self._ss_by_name.get(ss_default) if ss_default else None
+                if ss_assignment is None and ss_default:
                     self.output(f"WARNING: Default category '{ss_default}' not found in Self Service!")
-                    ss_assignment = None
             # Only reassign/override if not already set
             if ss_type == "prod":
                 if ss_name is not None:
@@ -251,6 +268,9 @@ class Configurator(Processor):
 
         get_self_service()  # assigns list of dicts to self.self_service
 
+        # Index categories by name once for O(1) lookups below
+        self._ss_by_name = {category.get("name"): category.get("id") for category in self.self_service}
+
         # Create and iter over ad hoc lists with categories/envs
         # If both recipe and mapping values defined, override with values set in recipe
         for cat, env in zip(
@@ -276,20 +296,24 @@ class Configurator(Processor):
         # Overwrite Kandji API URL from ENV or keep as set in config
         self.kandji_api_url = os.environ.get("KANDJI_API_URL", self.kandji_api_url)
 
-        # Confirm provided Kandji URL is valid
-        status_code, response = self._curl_cmd_exec(url=self.kandji_api_url.replace("api", "web-api"))
-        if "tenantNotFound" in response.values():
-            self.output(f"ERROR: Provided Kandji URL {self.kandji_api_url} appears invalid! Cannot upload...")
-            raise ProcessorError(f"ERROR: Provided Kandji URL {self.kandji_api_url} appears invalid! Cannot upload...")
+        # Confirm provided Kandji URL is valid (probe result is static per URL, so cache for a day)
+        if self._disk_cache_read("tenant_probe", expire=86400) is None:
+            status_code, response = self._curl_cmd_exec(url=self.kandji_api_url.replace("api", "web-api"))
+            if "tenantNotFound" in response.values():
+                self.output(f"ERROR: Provided Kandji URL {self.kandji_api_url} appears invalid! Cannot upload...")
+                raise ProcessorError(
+                    f"ERROR: Provided Kandji URL {self.kandji_api_url} appears invalid! Cannot upload..."
+                )
+            self._disk_cache_write("tenant_probe")
 
         # Assign tenant URL
         self.tenant_url = self.kandji_api_url.replace(".api.", ".")
         # Assign API domain
-        self.kandji_api_prefix = os.path.join(self.kandji_api_url, "api", "v1")
+        self.kandji_api_prefix = f"{self.kandji_api_url.rstrip('/')}/api/v1"
         # Define API endpoints
-        self.api_custom_apps_url = os.path.join(self.kandji_api_prefix, "library", "custom-apps")
-        self.api_upload_pkg_url = os.path.join(self.api_custom_apps_url, "upload")
-        self.api_self_service_url = os.path.join(self.kandji_api_prefix, "self-service", "categories")
+        self.api_custom_apps_url = f"{self.kandji_api_prefix}/library/custom-apps"
+        self.api_upload_pkg_url = f"{self.api_custom_apps_url}/upload"
+        self.api_self_service_url = f"{self.kandji_api_prefix}/self-service/categories"
 
         # Grab auth token for Kandji API interactions
         self.kandji_token = self._retrieve_token(self.kandji_token_name)
@@ -314,6 +338,9 @@ class Configurator(Processor):
         self.recipe_map_file = "recipe_map.json"
         self.audit_script = "audit_app_and_version.zsh"
 
+        # Pooled HTTP session shared by all API calls this run
+        self._http_session_init()
+
         # If env-specific custom app name(s) are defined for this recipe, these'll be overwritten below
         self.test_app, self.prod_app, self.custom_app_name = False, False, None
         # Assign vars from AutoPkg ENV
@@ -356,4 +383,15 @@ class Configurator(Processor):
         self._set_custom_name()
         self._set_slack_config()
         self._set_kandji_config()
-        self._populate_self_service()
+        # Only query Self Service categories when a category ID will actually be consumed
+        # Skips one HTTPS round-trip for the common audit-enforce/install-once recipes
+        if (
+            self.custom_app_enforcement == "no_enforcement"
+            or self.map_ss_category
+            or self.map_test_category
+            or self.recipe_ss_category
+            or self.recipe_test_category
+        ):
+            self._populate_self_service()
+        else:
+            self.ss_category_id, self.test_category_id = None, None
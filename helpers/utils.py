@@ -30,6 +30,7 @@
 #######################
 
 import difflib
+import io
 import json
 import os
 import plistlib
@@ -38,16 +39,169 @@ import shlex
 import shutil
 import tempfile
 import time
+import uuid
 import xml.etree.ElementTree as ETree
-from datetime import datetime
-from fileinput import FileInput
-from functools import reduce
+from datetime import datetime, timezone
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path, PosixPath
 from subprocess import PIPE, STDOUT, run
 from urllib.parse import urlsplit, urlunsplit
 
+import requests
 from autopkglib import Processor, ProcessorError
 from pip._vendor.packaging import version as packaging_version
+from requests.adapters import HTTPAdapter, Retry
+
+# Optional C JSON parser; large custom-apps payloads parse severalfold faster when present
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional C ISO-8601 parser; much faster than strptime on Kandji timestamps when present
+try:
+    from ciso8601 import parse_datetime
+except ImportError:
+
+    def parse_datetime(dt_str):
+        """Parses Kandji API datetime strings (with or without fractional seconds)
+        into TZ-aware UTC datetime objects"""
+        parsed_dt = datetime.strptime(dt_str, "%Y-%m-%dT%H:%M:%S.%fZ" if "." in dt_str else "%Y-%m-%dT%H:%M:%SZ")
+        return parsed_dt.replace(tzinfo=timezone.utc)
+
+
+class _CachedVersion(packaging_version.Version):
+    """packaging Version memoizing its hash; instances are shared through
+    _parse_version's cache, so repeat hashes skip re-walking the key tuple"""
+
+    def __hash__(self):
+        try:
+            return self._cached_hash
+        except AttributeError:
+            self._cached_hash = super().__hash__()
+            return self._cached_hash
+
+
+@lru_cache(maxsize=4096)
+def _parse_version(vers_str):
+    """Returns a packaging Version for `vers_str`, cached so repeat strings
+    resolve to one shared object instead of re-running the Version constructor"""
+    try:
+        return _CachedVersion(vers_str)
+    except packaging_version.InvalidVersion:
+        # Sanitized strs should always be PEP 440; defer to parse() if not
+        return packaging_version.parse(vers_str)
+
+
+@lru_cache(maxsize=4096)
+def _parse_dt(dt_str):
+    """Returns a TZ-aware datetime for `dt_str`, cached across repeat lookups
+    Tries the C-accelerated fromisoformat first (Kandji timestamps are ISO-8601
+    with a Z suffix), falling back to the full parser for anything it rejects"""
+    try:
+        return datetime.fromisoformat(dt_str.replace("Z", "+00:00"))
+    except ValueError:
+        return parse_datetime(dt_str)
+
+
+# Precompiled patterns for sanitizing version strings out of PKG names
+_RE_UUID = re.compile(r"_\w{8}(?=.pkg)")
+_RE_SPACE = re.compile(r"[ ]")
+_RE_NONVERS = re.compile(r"[^0-9.]")
+_RE_DOTS = re.compile(r"\.{2,}")
+_RE_EDGE = re.compile(r"^\.|\.$")
+
+# Bundle subdirs that never house the core app's Info.plist; pruned during PKG scans
+_EXCLUDED_DIRS = frozenset(
+    ("Extensions", "Frameworks", "Helpers", "Library", "MacOS", "PlugIns", "Resources", "SharedSupport", "opt", "bin")
+)
+
+# Slack attachment colors by notification status
+_SLACK_COLORS = {"SUCCESS": "00FF00", "WARNING": "E8793B", "ERROR": "FF0000"}
+
+# Matches the audit script assignment lines eligible for customization
+_AUDIT_RE = re.compile(
+    r"^(APP_NAME|BUNDLE_ID|PKG_ID|MINIMUM_ENFORCED_VERSION|CREATION_TIMESTAMP|DAYS_UNTIL_ENFORCEMENT)=.*$",
+    re.M,
+)
+
+
+@lru_cache(maxsize=256)
+def _ensure_https(url):
+    """Parses provided URL, formats, and returns to ensure proper scheme
+    Pure function of the input, so results are memoized; already-https
+    URLs short-circuit before any parsing"""
+    if url.startswith("https://"):
+        return url
+    parsed_url = urlsplit(url)
+    if not parsed_url.scheme or parsed_url.scheme == "http":
+        netloc = parsed_url.netloc if parsed_url.netloc else parsed_url.path
+        path = parsed_url.path if parsed_url.netloc else ""
+        new_url = parsed_url._replace(scheme="https", netloc=netloc, path=path)
+        return urlunsplit(new_url)
+    return url
+
+
+def _sanitize_vers(pkg_name):
+    """Gaudy gauntlet of regex formatting to sanitize the version from a PKG name"""
+    pkg_name = _RE_UUID.sub("", pkg_name)
+    pkg_name = _RE_SPACE.sub(".", pkg_name)
+    pkg_name = _RE_NONVERS.sub("", pkg_name)
+    pkg_name = _RE_DOTS.sub(".", pkg_name)
+    return _RE_EDGE.sub("", pkg_name)
+
+
+class _StreamedMultipart:
+    """File-like multipart/form-data body streaming a file from disk
+    requests sends read()-able bodies in fixed-size chunks, so peak memory
+    stays at one chunk instead of the fully assembled body; __len__ lets
+    requests set Content-Length up front (S3 rejects chunked uploads)"""
+
+    def __init__(self, fields, file_name, file_path):
+        self.boundary = uuid.uuid4().hex
+        preamble = "".join(
+            f'--{self.boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'
+            for name, value in fields.items()
+        )
+        preamble += (
+            f'--{self.boundary}\r\nContent-Disposition: form-data; name="file"; filename="{file_name}"\r\n'
+            "Content-Type: application/octet-stream\r\n\r\n"
+        )
+        preamble = preamble.encode()
+        epilogue = f"\r\n--{self.boundary}--\r\n".encode()
+        self._file = open(file_path, "rb")
+        self._parts = [io.BytesIO(preamble), self._file, io.BytesIO(epilogue)]
+        self._length = len(preamble) + os.path.getsize(file_path) + len(epilogue)
+
+    @property
+    def content_type(self):
+        """Content-Type header value carrying this body's boundary"""
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        """Marks the body as a stream for requests; yields read() chunks"""
+        return iter(lambda: self.read(65536), b"")
+
+    def read(self, size=-1):
+        """Reads up to size bytes spanning the form fields, file, and epilogue"""
+        if size is None or size < 0:
+            return b"".join(part.read() for part in self._parts)
+        chunk = b""
+        while self._parts and len(chunk) < size:
+            data = self._parts[0].read(size - len(chunk))
+            if data:
+                chunk += data
+            else:
+                self._parts.pop(0)
+        return chunk
+
+    def close(self):
+        """Closes the underlying file handle"""
+        self._file.close()
 
 
 class Utilities(Processor):
@@ -56,128 +210,170 @@ class Utilities(Processor):
     #####################################
 
     def _run_command(self, shell_exec):
-        """Runs a shell command and returns the response"""
-        raw_out = run(shlex.split(shell_exec), stdout=PIPE, stderr=STDOUT, shell=False, check=False)
+        """Runs a command (argv list or string) and returns the response
+        Lists are passed straight to exec — no shlex parse, no quoting pitfalls;
+        strings are kept for backward compat and split as before"""
+        argv = shell_exec if isinstance(shell_exec, list) else shlex.split(shell_exec)
+        raw_out = run(argv, stdout=PIPE, stderr=STDOUT, shell=False, check=False)
         exit_code = raw_out.returncode
         decoded_out = raw_out.stdout.decode().strip()
         if exit_code > 0:
-            self.output(f"ERROR: '{shell_exec}' failed with exit code {exit_code} and output '{decoded_out}'")
+            self.output(f"ERROR: '{shlex.join(argv)}' failed with exit code {exit_code} and output '{decoded_out}'")
             return False
         return decoded_out
 
     def _ensure_https(self, url):
-        """Parses provided URL, formats, and returns to ensure proper scheme for cURL"""
-        parsed_url = urlsplit(url)
-        if not parsed_url.scheme or parsed_url.scheme == "http":
-            netloc = parsed_url.netloc if parsed_url.netloc else parsed_url.path
-            path = parsed_url.path if parsed_url.netloc else ""
-            new_url = parsed_url._replace(scheme="https", netloc=netloc, path=path)
-            return urlunsplit(new_url)
-        return url
+        """Delegates to the memoized module-level _ensure_https"""
+        return _ensure_https(url)
 
     ######################
-    # cURL Wrapper Funcs
+    # HTTP Wrapper Funcs
     ######################
 
-    def _curl_cmd_exec(self, method="GET", url=None, files=None, data=None):
-        """Wrapper for cURL which includes HTTP response code line broken after response
+    def _http_session_init(self):
+        """Creates a pooled requests.Session for all HTTP interactions
+        Session keeps TCP+TLS connections alive across sequential API calls
+        (tenant probe, category/custom app GETs, presign, upload, create/update)
+        Transient GET 503s are retried at the transport with exponential backoff
+        Create/update 503s mean an upload is still processing server-side and need
+        a longer backoff, so they surface to _validate_curl_response, which owns them"""
+        self._http = requests.Session()
+        retries = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[503],
+            allowed_methods=frozenset({"GET"}),
+        )
+        self._http.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retries))
+
+    def _curl_cmd_exec(self, method="GET", url=None, files=None, data=None, headers=None):
+        """Wrapper for HTTP calls via pooled requests.Session (created in populate_from_config)
         Default method is GET, with support for POST and PATCH along with form and data submissions
-        Assigns received output to json_body and http_code, where json_body is created from response
+        `files` is a dict of multipart form fields (str values are wrapped as form data;
+        tuples/file objects pass through as file uploads); `data` is a dict of body fields
+        or a file-like streaming body; `headers` merges extra request headers
+        Assigns response to json_body and http_code, where json_body is created from response
         if not received directly from server; returns http_code and json_body"""
-        curl_prefix = f'curl -sw "\n%{{response_code}}" -L -X {method}'
-        curl_headers = '-H "Content-Type application/json"'
+        params = None
+        headers = dict(headers) if headers else {}
         url = self._ensure_https(url)
         # For Kandji client API interactions
         if "kandji.io/api" in url.lower():
-            curl_headers = curl_headers + f' -H "Authorization: Bearer {self.kandji_token}"'
-            curl_prefix = curl_prefix + " --url-query source=KAPPA"
-        curl_shell_exec = f"{curl_prefix} {curl_headers} {url} "
-        curl_shell_exec = (
-            curl_shell_exec + files
-            if files
-            else curl_shell_exec + f"--data-urlencode '{data}'"
-            if data
-            else curl_shell_exec
-        )
-        # Shell out to cURL and validate success
-        raw_out = run(curl_shell_exec, stdout=PIPE, stderr=STDOUT, shell=True, check=False)
-        exit_code = raw_out.returncode
-        decoded_out = raw_out.stdout.decode().strip()
-        if exit_code > 0:
-            self.output(f"ERROR: cURL command failed with exit code {exit_code} and output {decoded_out}")
+            headers["Authorization"] = f"Bearer {self.kandji_token}"
+            params = {"source": "KAPPA"}
+        if files:
+            # Wrap bare values as (filename, value) tuples valid for form submission
+            files = {k: v if isinstance(v, tuple) or hasattr(v, "read") else (None, str(v)) for k, v in files.items()}
+        try:
+            resp = self._http.request(
+                method, url, headers=headers, params=params, files=files, data=data, timeout=(5, 30)
+            )
+        except requests.RequestException as err:
+            self.output(f"ERROR: HTTP {method} to {url} failed with error {err}")
             return False, False
-        # Split response code from output
-        line_broken_out = decoded_out.splitlines()
-        match len(line_broken_out):
+        http_code = resp.status_code  # HTTP Response
+        if not resp.content:
             # No response, so assign json_body to received HTTP code
-            case 1:
-                http_code = int(decoded_out)  # HTTP Response
-                json_body = {"HTTP Status Code", http_code}  # JSON body
-            case _:
-                try:
-                    http_code = "".join(line_broken_out[-1])
-                    response_body = "".join(line_broken_out[:-1])
-                except IndexError as err:
-                    self.output(f"Got {line_broken_out} and {decoded_out} with error {err}")
-                try:
-                    json_body = json.loads(response_body)  # JSON body
-                except json.decoder.JSONDecodeError:
-                    json_body = {"cURL Response": str(response_body)}
-
-        http_code = int(http_code)  # HTTP Response
+            json_body = {"HTTP Status Code": http_code}  # JSON body
+        elif resp.headers.get("content-type", "").startswith("application/json"):
+            # Parse the raw bytes directly (no str decode round-trip) with orjson when available
+            json_body = orjson.loads(resp.content) if orjson is not None else resp.json()  # JSON body
+        else:
+            json_body = {"cURL Response": resp.text}
         return http_code, json_body
 
+    def _handle_get(self, response, action):
+        """Assigns list of custom apps from GET response
+        Index once at assignment: name -> matching apps, plus PKG basenames
+        Downstream lookups then avoid rescanning the full list per call"""
+        self.custom_apps = response.get("results")
+        self._apps_by_name = {}
+        for app in self.custom_apps:
+            self._apps_by_name.setdefault(app.get("name"), []).append(app)
+        self._apps_pkg_basenames = [
+            (os.path.basename(app.get("file_key")), app)
+            for app in self.custom_apps
+            if app.get("file_key", "").endswith(".pkg")
+        ]
+
+    def _handle_get_selfservice(self, response, action):
+        """Populates categories from Self Service response"""
+        self.self_service = response
+
+    def _handle_presign(self, response, action):
+        """Assigns S3 presign response for upload URL"""
+        self.s3_generated_req = response
+
+    def _handle_upload(self, response, action):
+        """Reports upload success"""
+        self.output(f"Successfully uploaded {self.pkg_name}!")
+        # Initial sleep allowing S3 to process upload
+        time.sleep(5)
+
+    def _handle_create_update(self, response, action):
+        """Reports create/update success, posting Custom App details to Slack"""
+        custom_app_id = response.get("id")
+        custom_name = response.get("name")
+        custom_app_enforcement = response.get("install_enforcement")
+        config_named_enforcement = self._parse_enforcement(custom_app_enforcement)
+        custom_app_url = f"{self.tenant_url.rstrip('/')}/library/custom-apps/{custom_app_id}"
+        self.output(f"SUCCESS: Custom App {action.capitalize()}")
+        self.output(f"Custom App '{custom_name}' available at '{custom_app_url}'")
+        self.slack_notify(
+            "SUCCESS",
+            f"Custom App {action.capitalize()}d",
+            f"*Name*: `{custom_name}`\n*ID*: `{custom_app_id}`\n*PKG*: `{self.pkg_name}`\n*Enforcement*: `{config_named_enforcement}`",
+            f"{custom_app_url}",
+        )
+
+    # O(1) action dispatch for healthy responses in _validate_curl_response
+    _ACTION_HANDLERS = {
+        "get": _handle_get,
+        "get_selfservice": _handle_get_selfservice,
+        "presign": _handle_presign,
+        "upload": _handle_upload,
+        "create": _handle_create_update,
+        "update": _handle_create_update,
+    }
+
     def _validate_curl_response(self, http_code, response, action):
         """Check HTTP response from cURL command; if healthy, take action
         according to the provided method where "get" assigns list of custom apps to var;
         "get_selfservice" populates categories from Self Service; "presign" assigns S3 response for upload URL
         "upload" reports upload success; "create"/"update" reports success, posting Custom App details to Slack
-        HTTP response of 503 means an upload is still processing and will retry after 5 seconds
+        HTTP response of 503 means an upload is still processing and will retry with backoff
         Anything else is treated as an error and notifies to Slack with HTTP code and response
         Identified HTTP code 401 adds language to validate permissions for the passed token"""
+        # Transport failure (no HTTP status); must be caught ahead of the success
+        # check below since False compares as 0 and would dispatch a success handler
+        if http_code is False:
+            error_body = f"`{self.custom_app_name}`/`{self.pkg_name}` failed to {action}: request did not complete"
+            self.output(f"ERROR: Failed to {action.capitalize()} Custom App (no HTTP response)\n{error_body}")
+            self.slack_notify(
+                "ERROR",
+                f"Failed to {action.capitalize()} Custom App (no HTTP response)",
+                f"{error_body}",
+            )
+            raise ProcessorError(f"ERROR: Failed to {action.capitalize()} Custom App (no HTTP response)\n{error_body}")
         if http_code <= 204:
-            # Identify specified action and invoke func
-            match action.lower():
-                case "get":
-                    self.custom_apps = response.get("results")
-                case "get_selfservice":
-                    self.self_service = response
-                case "presign":
-                    self.s3_generated_req = response
-                case "upload":
-                    self.output(f"Successfully uploaded {self.pkg_name}!")
-                    # Initial sleep allowing S3 to process upload
-                    time.sleep(5)
-                case "create" | "update":
-                    custom_app_id = response.get("id")
-                    custom_name = response.get("name")
-                    custom_app_enforcement = response.get("install_enforcement")
-                    config_named_enforcement = self._parse_enforcement(custom_app_enforcement)
-                    custom_app_url = os.path.join(self.tenant_url, "library", "custom-apps", custom_app_id)
-                    self.output(f"SUCCESS: Custom App {action.capitalize()}")
-                    self.output(f"Custom App '{custom_name}' available at '{custom_app_url}'")
-                    self.slack_notify(
-                        "SUCCESS",
-                        f"Custom App {action.capitalize()}d",
-                        f"*Name*: `{custom_name}`\n*ID*: `{custom_app_id}`\n*PKG*: `{self.pkg_name}`\n*Enforcement*: `{config_named_enforcement}`",
-                        f"{custom_app_url}",
-                    )
-                case _:
-                    self.output(
-                        f"Assignment for 'action' must be one of [get|get_selfservice|presign|upload|create|update]; got '{action}'"
-                    )
-                    raise ProcessorError(f"Assignment for 'action' must be one of [get|get_selfservice|presign|upload|create|update]; got '{action}'")
+            # Identify specified action and invoke handler
+            handler = self._ACTION_HANDLERS.get(action.lower())
+            if handler is None:
+                self.output(
+                    f"Assignment for 'action' must be one of [get|get_selfservice|presign|upload|create|update]; got '{action}'"
+                )
+                raise ProcessorError(f"Assignment for 'action' must be one of [get|get_selfservice|presign|upload|create|update]; got '{action}'")
+            handler(self, response, action.lower())
             return True
-        elif http_code == 503 and (action.lower() == "update" or "create"):
-            self.output(f"WARNING: (HTTP {http_code}): {response.get('detail')}\nRetrying in five seconds...")
-            time.sleep(5)
-            return (
-                self.create_custom_app()
-                if action.lower() == "create"
-                else self.update_custom_app()
-                if action.lower() == "update"
-                else None
-            )
+        elif http_code == 503 and action.lower() in ("create", "update") and getattr(self, "_retry_count", 0) < 3:
+            # Upload still processing server-side; back off and retry (bounded)
+            # Transport retries skip non-GET statuses, so this branch owns create/update 503s
+            # Once the budget is spent, the 503 falls through to the error/Slack path below
+            self._retry_count = getattr(self, "_retry_count", 0) + 1
+            backoff = 5 * self._retry_count
+            self.output(f"WARNING: (HTTP {http_code}): {response.get('detail')}\nRetrying in {backoff} seconds...")
+            time.sleep(backoff)
+            return self.create_custom_app() if action.lower() == "create" else self.update_custom_app()
         else:
             error_body = f"`{self.custom_app_name}`/`{self.pkg_name}` failed to {action}: `{response}`"
             if http_code == 401:
@@ -198,66 +394,81 @@ class Utilities(Processor):
 
     def _customize_audit_for_upload(self):
         """Finally a worthy Python replacement for sed
-        Gets current TS and iters over audit script line by line
-        Searches for our keys and updates them with assigned vals
+        Builds replacement lines for any keys with assigned vals, then rewrites
+        the audit script with a single anchored regex pass over its contents
         Creates a backup file before modification"""
-        epoch_now = datetime.now().strftime("%s")
-        with FileInput(files=self.audit_script_path, inplace=True, backup=".bak", encoding="utf-8") as f:
-            for line in f:
-                line = line.rstrip()  # noqa: PLW2901
-                if "APP_NAME=" in line and hasattr(self, "app_name") and self.app_name is not None:
-                    line = f'APP_NAME="{self.app_name}"'  # noqa: PLW2901
-                elif "BUNDLE_ID=" in line and hasattr(self, "bundle_id") and self.bundle_id is not None:
-                    line = f'BUNDLE_ID="{self.bundle_id}"'  # noqa: PLW2901
-                elif "PKG_ID=" in line and hasattr(self, "pkg_id") and self.pkg_id is not None:
-                    line = f'PKG_ID="{self.pkg_id}"'  # noqa: PLW2901
-                elif "MINIMUM_ENFORCED_VERSION=" in line and hasattr(self, "app_vers") and self.app_vers is not None:
-                    line = f'MINIMUM_ENFORCED_VERSION="{self.app_vers}"'  # noqa: PLW2901
-                elif "CREATION_TIMESTAMP=" in line:
-                    line = f'CREATION_TIMESTAMP="{epoch_now}"'  # noqa: PLW2901
-                elif "DAYS_UNTIL_ENFORCEMENT=" in line:
-                    line = (  # noqa: PLW2901
-                        f"DAYS_UNTIL_ENFORCEMENT={self.test_delay}"
-                        if self.test_app is True
-                        else f"DAYS_UNTIL_ENFORCEMENT={self.prod_delay}"
-                        if self.prod_app is True
-                        else f"DAYS_UNTIL_ENFORCEMENT={self.prod_delay}"
-                        if self.prod_delay
-                        else line
-                    )
-                # Print here writes to file vs. stdout
-                print(line)
+        # Current TS via time.time (strftime %s is platform-dependent)
+        epoch_now = int(time.time())
+        # On-disk contents are about to change, so drop the cached copy
+        self.__dict__.pop("_audit_script_text", None)
+        enforce_delay = (
+            self.test_delay
+            if self.test_app is True
+            else self.prod_delay
+            if self.prod_app is True
+            else self.prod_delay
+            if self.prod_delay
+            else None
+        )
+        # Assignment lines keyed by var name; unset keys pass through untouched
+        repl_lines = {"CREATION_TIMESTAMP": f'CREATION_TIMESTAMP="{epoch_now}"'}
+        if getattr(self, "app_name", None) is not None:
+            repl_lines["APP_NAME"] = f'APP_NAME="{self.app_name}"'
+        if getattr(self, "bundle_id", None) is not None:
+            repl_lines["BUNDLE_ID"] = f'BUNDLE_ID="{self.bundle_id}"'
+        if getattr(self, "pkg_id", None) is not None:
+            repl_lines["PKG_ID"] = f'PKG_ID="{self.pkg_id}"'
+        if getattr(self, "app_vers", None) is not None:
+            repl_lines["MINIMUM_ENFORCED_VERSION"] = f'MINIMUM_ENFORCED_VERSION="{self.app_vers}"'
+        if enforce_delay is not None:
+            repl_lines["DAYS_UNTIL_ENFORCEMENT"] = f"DAYS_UNTIL_ENFORCEMENT={enforce_delay}"
+        audit_script = Path(self.audit_script_path)
+        # Create a backup file before modification (restored post-upload)
+        shutil.copy2(audit_script, self.audit_script_path + ".bak")
+        audit_text = audit_script.read_text(encoding="utf-8")
+        audit_text = _AUDIT_RE.sub(lambda match: repl_lines.get(match.group(1), match.group(0)), audit_text)
+        audit_script.write_text(audit_text, encoding="utf-8")
+
+    def _audit_script_read(self):
+        """Returns audit script contents, read once per process and cached
+        Cache is dropped whenever the script is rewritten or restored on disk"""
+        if not hasattr(self, "_audit_script_text"):
+            self._audit_script_text = Path(self.audit_script_path).read_text()
+        return self._audit_script_text
 
     def _restore_audit(self):
         """Overwrite customized audit script with clean backup"""
         shutil.move(self.audit_script_path + ".bak", self.audit_script_path)
+        self.__dict__.pop("_audit_script_text", None)
 
     ######################
     # Token Lookup Funcs
     ######################
 
     def _env_token_get(self, item_name):
-        """Searches ENV for str `item_name`"""
-        token = os.environ.get(item_name, None)
-        # Also search for val from uppercase ENV name
-        upper_token = os.environ.get(item_name.upper(), None)
-        if token is None:
-            token = upper_token if upper_token is not None else None
-        return token
+        """Searches ENV for str `item_name`, falling back to its uppercase form"""
+        return os.environ.get(item_name) or os.environ.get(item_name.upper())
 
     def _keychain_token_get(self, item_name):
         """Retrieves and returns a secret stored at `item_name` from the keychain"""
-        shell_cmd = f"/usr/bin/security find-generic-password -w -s {item_name} -a 'KAPPA'"
+        shell_cmd = ["/usr/bin/security", "find-generic-password", "-w", "-s", item_name, "-a", "KAPPA"]
         decoded_out = self._run_command(shell_cmd)
         return decoded_out if decoded_out is not False else None
 
     def _retrieve_token(self, item_name):
         """Searches for by name and returns token for keystores toggled for use
-        If multiple keystores are enabled, first searches ENV for token, then if not found, keychain"""
+        If multiple keystores are enabled, first searches ENV for token, then if not found, keychain
+        Tokens are immutable within a run, so lookups are memoized per name to avoid
+        repeat keystore hits (keychain path forks a `security` subprocess)"""
+        if not hasattr(self, "_token_cache"):
+            self._token_cache = {}
+        if item_name in self._token_cache:
+            return self._token_cache[item_name]
         token_val = None
         token_val = self._env_token_get(item_name) if self.token_keystores.get("environment") is True else None
         if not token_val:
             token_val = self._keychain_token_get(item_name) if self.token_keystores.get("keychain") is True else None
+        self._token_cache[item_name] = token_val
         return token_val
 
     ######################
@@ -270,69 +481,85 @@ class Utilities(Processor):
         and proceeds with PackageInfo lookup to enforce install/version from PKG metadata; ends run with temp dir delete
         """
 
+        # Cumulative dir sizes for the expanded PKG; built lazily on first candidate tie-break
+        dir_sizes = None
+
+        def _build_dir_sizes(root):
+            """Scans the expanded PKG once with an explicit stack (no Python frame
+            per directory), summing file sizes into every directory (cumulative)
+            so candidate tie-breaks never rescan subtrees
+            DirEntry type checks ride the cached readdir d_type, so the only
+            syscall per entry is the stat for regular files' sizes
+            Symlinks are not followed to avoid inf recursion"""
+            sizes = {}
+            parents = {}
+            discovery_order = []
+            stack = [root]
+            while stack:
+                dirpath = stack.pop()
+                discovery_order.append(dirpath)
+                total = 0
+                try:
+                    with os.scandir(dirpath) as entries:
+                        for entry in entries:
+                            if entry.is_dir(follow_symlinks=False):
+                                parents[entry.path] = dirpath
+                                stack.append(entry.path)
+                            elif entry.is_file(follow_symlinks=False):
+                                try:
+                                    total += entry.stat(follow_symlinks=False).st_size
+                                except OSError:
+                                    continue
+                except OSError:
+                    pass
+                sizes[dirpath] = total
+            # Children always follow their parent in DFS discovery order, so a
+            # reversed pass propagates subtree sums bottom-up
+            for dirpath in reversed(discovery_order):
+                parent = parents.get(dirpath)
+                if parent is not None:
+                    sizes[parent] += sizes[dirpath]
+            return sizes
+
         def _get_largest_entry(file_list):
             """Locates largest directory housing file from a list of files"""
-
-            def _get_dir_size(path="."):
-                """Subfunc to iterate over a dir and return sum total bytesize
-                Defaults to local directory with "." if no arg passed"""
-                total = 0
-                with os.scandir(path) as directory:
-                    for entry in directory:
-                        # Ignore symlinks that could lead to inf recursion
-                        if entry.is_file(follow_symlinks=False):
-                            total += entry.stat(follow_symlinks=False).st_size
-                        elif entry.is_dir(follow_symlinks=False):
-                            total += _get_dir_size(entry.path)
-                return total
-
-            # Create tmp dict
-            dir_sizes = {}
-            # Iter and assign plist as key and parent dir size as val
-            for file in file_list:
-                dir_sizes[file] = _get_dir_size(os.path.dirname(file))
+            nonlocal dir_sizes
+            if dir_sizes is None:
+                dir_sizes = _build_dir_sizes(tmp_pkg_path)
             # Get file associated with largest size
-            likely_file = max(dir_sizes, key=dir_sizes.get)
-            return likely_file
+            return max(file_list, key=lambda file: dir_sizes.get(os.path.dirname(str(file)), 0))
 
         def _pkg_expand(src, dst):
             """Subprocess runs pkgutil --expand-full
             on source src, expanding to destination dst"""
-            # Shell out to do PKG expansion and validate success
-            shell_cmd = f"pkgutil --expand-full '{src}' '{dst}'"
+            # Exec PKG expansion directly (argv list, so quotes in paths are safe)
+            shell_cmd = ["/usr/sbin/pkgutil", "--expand-full", src, dst]
             if self._run_command(shell_cmd) is not False:
                 return True
             return False
 
-        def _plist_find_return(exploded_pkg):
-            """Locates all Info.plists within a provided expanded PKG path
-            Identifies likely plist for core app (if multiple), populating
-            dict with bundle ID, name, and version; returns dict and plist path"""
-            # Make pathlib.Path obj from exploded PKG
-            expanded_pkg_path = Path(exploded_pkg)
-            # Find all Info.plists
-            info_plist_paths = expanded_pkg_path.glob("**/Info.plist")
-            # Rule out Info.plists in nonstandard dirs
-            core_app_plists = [
-                plist
-                for plist in info_plist_paths
-                if "Contents/Info.plist" in plist.as_posix()
-                and all(
-                    folder not in plist.as_posix()
-                    for folder in (
-                        "Extensions/",
-                        "Frameworks/",
-                        "Helpers/",
-                        "Library/",
-                        "MacOS/",
-                        "PlugIns/",
-                        "Resources/",
-                        "SharedSupport/",
-                        "opt/",
-                        "bin/",
-                    )
-                )
-            ]
+        def _scan_pkg(root):
+            """Walks an expanded PKG once, locating all Info.plist, Distribution,
+            and PackageInfo files in a single pass; prunes bundle subdirs that
+            never house the core app plist so those subtrees are never descended"""
+            plists, distros, pkginfos = [], [], []
+            for dirpath, dirnames, filenames in os.walk(root):
+                dirnames[:] = [dirname for dirname in dirnames if dirname not in _EXCLUDED_DIRS]
+                for name in filenames:
+                    if name == "Info.plist":
+                        plists.append(os.path.join(dirpath, name))
+                    elif name == "PackageInfo":
+                        pkginfos.append(os.path.join(dirpath, name))
+                    elif name == "Distribution":
+                        distros.append(os.path.join(dirpath, name))
+            return plists, distros, pkginfos
+
+        def _plist_find_return(info_plist_paths):
+            """Identifies likely plist for core app (if multiple) from the located
+            Info.plists, populating dict with bundle ID, name, and version;
+            returns dict and plist path"""
+            # Rule out Info.plists in nonstandard dirs (excluded subtrees already pruned)
+            core_app_plists = [plist for plist in info_plist_paths if plist.endswith("Contents/Info.plist")]
 
             # If more than one found
             if len(core_app_plists) > 1:
@@ -343,18 +570,19 @@ class Utilities(Processor):
                 # If no plists found, raise RuntimeError to proceed with PackageInfo lookup
                 raise RuntimeError
 
-            # Quickly iter and assign all plist values we want
+            # Read and parse the plist once, then assign all values we want
             def lookup_from_plist():
+                parsed_plist = plistlib.loads(Path(likely_plist).read_bytes())
                 return {
-                    k: plistlib.load(open(likely_plist, "rb")).get(k)
+                    k: parsed_plist.get(k)
                     for k in ("CFBundleIdentifier", "CFBundleShortVersionString", "CFBundleName")
                 }
 
             # Run and return
             return lookup_from_plist(), likely_plist
 
-        def _pkg_metadata_find_return(exploded_pkg):
-            """Locates all identifying metadata files within an expanded PKG path
+        def _pkg_metadata_find_return(distro_files, package_infos):
+            """Reads identifying metadata files located within an expanded PKG path
             If multiple PackageInfo, attempts query of pkg-ref from Distribution
             If PackageInfo Identifies likely PackageInfo (if multiple), populating values
             for PKG ID and PKG version if set and returning"""
@@ -365,24 +593,17 @@ class Utilities(Processor):
                 # Convert to str if PosixPath
                 if type(xml_file) == PosixPath:
                     xml_file = xml_file.as_posix()
-                with open(xml_file) as f:
-                    parsed_xml = ETree.parse(f)
+                # Read once and parse from bytes (no lingering file handle)
+                parsed_xml = ETree.fromstring(Path(xml_file).read_bytes())
                 if "Distribution" in xml_file:
                     distro_pkg_info = parsed_xml.find("pkg-ref").attrib
                     pkg_id = distro_pkg_info.get("id")
                     pkg_vers = distro_pkg_info.get("version")
                 elif "PackageInfo" in xml_file:
-                    pkginfo_info = parsed_xml.getroot()
-                    pkg_id = pkginfo_info.get("identifier")
-                    pkg_vers = pkginfo_info.get("version")
+                    pkg_id = parsed_xml.get("identifier")
+                    pkg_vers = parsed_xml.get("version")
                 return pkg_id, pkg_vers
 
-            # Make pathlib.Path obj from exploded PKG
-            expanded_pkg_path = Path(exploded_pkg)
-            # Find all Distribution/PackageInfo files
-            distro_files = list(expanded_pkg_path.glob("**/Distribution"))
-            package_infos = list(expanded_pkg_path.glob("**/PackageInfo"))
-
             # If more than one found
             if len(package_infos) > 1:
                 # If Distro file found, use first pkg-ref from Distro file as truth
@@ -419,14 +640,22 @@ class Utilities(Processor):
         ##############
 
         # Create temp dir and assign var for expanded PKG
-        temp_dir = tempfile.TemporaryDirectory()
+        # pkg_expand_dir (if configured) redirects the expansion, e.g. to a RAM disk,
+        # so gigabytes of soon-deleted payload never hit the SSD
+        expand_dir = getattr(self, "default_pkg_expand_dir", None)
+        if expand_dir is not None and not os.path.isdir(expand_dir):
+            self.output(f"WARNING: Configured pkg_expand_dir '{expand_dir}' not found! Using default temp location")
+            expand_dir = None
+        temp_dir = tempfile.TemporaryDirectory(dir=expand_dir)
         tmp_pkg_path = os.path.join(temp_dir.name, self.pkg_name)
 
         if _pkg_expand(self.pkg_path, tmp_pkg_path) is False:
             self.output(f"ERROR: Unable to read plist as PKG {self.pkg_path} failed to expand")
             raise ProcessorError(f"Unable to read plist as PKG {self.pkg_path} failed to expand")
+        # Locate all metadata candidates with one walk of the expanded tree
+        info_plists, distro_files, package_infos = _scan_pkg(tmp_pkg_path)
         try:
-            plist_values, likely_plist = _plist_find_return(tmp_pkg_path)
+            plist_values, likely_plist = _plist_find_return(info_plists)
 
             try:
                 self.bundle_id = plist_values["CFBundleIdentifier"]
@@ -450,7 +679,7 @@ class Utilities(Processor):
         except RuntimeError:
             self.output("WARNING: No valid app plist found in PKG!")
             self.output("Attempting lookup from PackageInfo file...")
-            self.pkg_id, self.app_vers = _pkg_metadata_find_return(tmp_pkg_path)
+            self.pkg_id, self.app_vers = _pkg_metadata_find_return(distro_files, package_infos)
             self.output(f"Found PKG ID '{self.pkg_id}' with PKG Version '{self.app_vers}'")
             self.output("Will be used for audit enforcement if enabled")
         # rm dir + exploded PKG when done
@@ -465,9 +694,9 @@ class Utilities(Processor):
         """Searches for custom app to update from existing items in Kandji library
         If none match, attempts to find custom app dynamically by PKG name similarity
         if more than one match found, collates metadata for matches and reports to Slack with error"""
-        # Locate custom app by name
+        # Locate custom app by name via the prebuilt index
         self.output(f"Searching for {self.custom_app_name} from list of custom apps")
-        app_picker = [app for app in self.custom_apps if self.custom_app_name == app.get("name")]
+        app_picker = self._apps_by_name.get(self.custom_app_name, [])
         # If not found, try to find dynamically
         if not app_picker:
             self.output(f"WARNING: No existing LI found for provided name '{self.custom_app_name}'!")
@@ -501,13 +730,9 @@ class Utilities(Processor):
                 # Get PKG name without abs path
                 custom_app_pkg = os.path.basename(custom_app.get("file_key"))
                 custom_app_created = custom_app.get("created_at")
-                custom_app_created_fmt = (
-                    datetime.strptime(custom_app_created, "%Y-%m-%dT%H:%M:%S.%fZ")
-                    .astimezone()
-                    .strftime("%m/%d/%Y @ %I:%M %p")
-                )
+                custom_app_created_fmt = parse_datetime(custom_app_created).astimezone().strftime("%m/%d/%Y @ %I:%M %p")
                 custom_app_updated = custom_app.get("file_updated")
-                custom_app_url = os.path.join(self.tenant_url, "library", "custom-apps", custom_app_id)
+                custom_app_url = f"{self.tenant_url.rstrip('/')}/library/custom-apps/{custom_app_id}"
                 custom_app_url = self._ensure_https(custom_app_url)
                 # Append matching custom app names/MD to Slack body to post
                 slack_body += f"*<{custom_app_url}|Custom App Created _{custom_app_created_fmt}_>*\n*PKG*: `{custom_app_pkg}` (*uploaded* _{custom_app_updated}_)\n\n"
@@ -535,45 +760,43 @@ class Utilities(Processor):
         ####################
         # Dynamic population
         ####################
-        # Define a function to parse the datetime strings
-        def parse_dt(dt_str):
-            """Parses datetime strings from Kandji API into datetime objects"""
-            try:
-                return datetime.strptime(dt_str, "%Y-%m-%dT%H:%M:%S.%fZ").astimezone()
-            except ValueError:
-                return datetime.strptime(dt_str, "%Y-%m-%dT%H:%M:%SZ").astimezone()
-
-        # Get PKG names (no path) if .pkg is suffix
-        all_pkg_names = [
-            os.path.basename(app.get("file_key")) for app in self.custom_apps if app.get("file_key").endswith(".pkg")
-        ]
+        # Get PKG names (no path) if .pkg is suffix (prebuilt alongside the custom apps GET)
+        all_pkg_names = [pkg for pkg, _ in self._apps_pkg_basenames]
+        # Index app records by PKG basename once; lookups below then skip O(N) rescans
+        apps_by_pkg = {}
+        for pkg, app in self._apps_pkg_basenames:
+            apps_by_pkg.setdefault(pkg, []).append(app)
+        # Setting limit to .85 is the sweet spot to account for variations in versions
+        # Still high enough to exclude both version and name changes (reducing false positives)
+        ratio_limit = 0.85
         # Create dict to hold PKG names and their similarity scores
         similarity_scores = {}
 
+        # Reuse one matcher with our PKG fixed as seq2 so its stats are computed once
+        matcher = difflib.SequenceMatcher(None, "", self.pkg_name)
         for pkg in all_pkg_names:
-            # re.sub to remove the _ + random UUID chars prepended to .pkg
-            similarity_scores[pkg] = difflib.SequenceMatcher(
-                None, re.sub(r"_\w{8}(?=.pkg)", "", pkg), self.pkg_name
-            ).ratio()
-
-        # Sort dict by similarity scores
-        sorted_similar_pkgs = dict(sorted(similarity_scores.items(), key=lambda k: k[1], reverse=True))
-
-        # Gaudy gauntlet of regex formatting to sanitize the version
-        re_replacements = {r"_\w{8}(?=.pkg)": "", r"[ ]": ".", "[^0-9\\.]": "", r"[.]{2,}": ".", r"^\.|\.$": ""}
-        # Setting limit to .85 is the sweet spot to account for variations in versions
-        # Still high enough to exclude both version and name changes (reducing false positives)
-        ratio_limit = 0.85
-        # Grab all PKG names that are above our sim threshold
-        possible_pkgs = [pkg for pkg in sorted_similar_pkgs.keys() if sorted_similar_pkgs.get(pkg) >= ratio_limit]
+            # Remove the _ + random UUID chars prepended to .pkg
+            matcher.set_seq1(_RE_UUID.sub("", pkg))
+            # Cheap upper bounds rule out most candidates before the O(N*M) full ratio
+            if matcher.real_quick_ratio() < ratio_limit or matcher.quick_ratio() < ratio_limit:
+                continue
+            score = matcher.ratio()
+            if score >= ratio_limit:
+                similarity_scores[pkg] = score
+
+        # All surviving PKG names are above our sim threshold; order by score desc
+        possible_pkgs = sorted(similarity_scores, key=similarity_scores.get, reverse=True)
 
         # If possible_apps defined, we were given a specific name to validate against
         provided_app_name = None
         if possible_apps:
             matching_pkgs = []
+            # Lowercase candidates and file_keys once, outside the match loops
+            possible_pkgs_lower = [(pkg, pkg.lower()) for pkg in possible_pkgs]
             for possible in possible_apps:
+                file_key_lower = (possible.get("file_key") or "").lower()
                 # Any matches are added to matching_pkgs list
-                matching_pkgs.extend(pkg for pkg in possible_pkgs if pkg in possible.get("file_key"))
+                matching_pkgs.extend(pkg for pkg, pkg_lower in possible_pkgs_lower if pkg_lower in file_key_lower)
             # One or more matches, reassign var
             if matching_pkgs:
                 possible_pkgs = matching_pkgs
@@ -581,62 +804,52 @@ class Utilities(Processor):
             provided_app_name = "".join({possible.get("name") for possible in possible_apps})
 
         # Dict to hold PKG names and their sanitized vers strs for semantic parsing
-        pkgs_versions = {
-            maybepkg: reduce(
-                lambda parsed_vers, match_replace: re.sub(*match_replace, parsed_vers),
-                re_replacements.items(),
-                maybepkg,
-            )
-            for maybepkg in possible_pkgs
-        }
+        pkgs_versions = {maybepkg: _sanitize_vers(maybepkg) for maybepkg in possible_pkgs}
 
-        # Sort PKGs according to semantic versioning
-        pkgs_versions_sorted = dict(
-            sorted(pkgs_versions.items(), key=lambda k: packaging_version.parse(k[1]), reverse=True)
-        )
+        # Parse each version string exactly once (itemgetter key dispatches in C,
+        # no per-comparison parse)
+        parsed_versions = [(maybepkg, _parse_version(vers or "0")) for maybepkg, vers in pkgs_versions.items()]
 
         try:
             custom_app = None
-            # Iter over it and grab first item with highest vers
-            custom_pkg_name, custom_pkg_vers = next(iter(pkgs_versions_sorted.items()))
-
-            # Get custom PKG name with highest version
-            highest_vers = [
-                pkg for pkg in pkgs_versions_sorted.keys() if custom_pkg_vers in pkgs_versions_sorted.get(pkg)
-            ]
+            if not parsed_versions:
+                raise StopIteration("no candidate PKGs found")
+            # Grab item with highest vers; O(n) max beats sorting the whole list
+            custom_pkg_name, top_parsed_vers = max(parsed_versions, key=itemgetter(1))
+
+            # Get custom PKG name(s) tied at the highest version, compared on parsed
+            # versions (substring checks would false-positive when one version
+            # prefixes another, e.g. 1.2 vs 1.2.3)
+            highest_vers = [pkg for pkg, parsed_vers in parsed_versions if parsed_vers == top_parsed_vers]
             # Check if more than one vers found matching highest
             if len(highest_vers) > 1:
-                # Create dict to hold PKG names and their mod dates
-                pkg_custom_app_updated = {}
+                # Parallel lists of PKG names and their mod dates (no per-candidate dicts)
+                # Parse timestamps once at collection; min() then compares datetimes directly
+                tie_pkgs, tie_timestamps = [], []
                 for pkg in highest_vers:
                     try:
                         # Find the matching app record
-                        app_record = next(app for app in self.custom_apps if pkg in app.get("file_key"))
-                        pkg_uploaded = app_record.get("file_updated")
-                        custom_li_modified = app_record.get("updated_at")
-                        # Append to dict
-                        pkg_custom_app_updated[pkg] = {
-                            "pkg_uploaded": pkg_uploaded,
-                            "custom_li_modified": custom_li_modified,
-                        }
+                        app_record = next(iter(apps_by_pkg.get(pkg, [])))
                     # Not found if searching only names matching user input
                     except StopIteration:
-                        pass
+                        continue
+                    tie_pkgs.append(pkg)
+                    tie_timestamps.append(
+                        (_parse_dt(app_record.get("file_updated")), _parse_dt(app_record.get("updated_at")))
+                    )
                 # Find the oldest app by first pkg_uploaded, and if identical, custom_li_modified
-                oldest_app = min(
-                    pkg_custom_app_updated,
-                    key=lambda key: (
-                        parse_dt(pkg_custom_app_updated[key]["pkg_uploaded"]),
-                        parse_dt(pkg_custom_app_updated[key]["custom_li_modified"]),
-                    ),
-                )
-                custom_pkg_name = oldest_app
+                oldest_idx = min(range(len(tie_pkgs)), key=tie_timestamps.__getitem__)
+                custom_pkg_name = tie_pkgs[oldest_idx]
 
             # Assign this as our best guess PKG
-            matching_entry = [app for app in self.custom_apps if custom_pkg_name in app.get("file_key")]
+            matching_entry = apps_by_pkg.get(custom_pkg_name, [])
             if len(matching_entry) > 1:
-                if provided_app_name is not None:
-                    matching_entry = [app for app in matching_entry if provided_app_name in app.get("name")]
+                # Lowercase the needle once; single pass keeps every record
+                # unless a provided name rules it out (case-insensitively)
+                name_needle = None if provided_app_name is None else provided_app_name.lower()
+                matching_entry = [
+                    app for app in matching_entry if name_needle is None or name_needle in (app.get("name") or "").lower()
+                ]
             custom_app = next(iter(matching_entry))
             custom_app_id = custom_app.get("id")
             custom_name = custom_app.get("name")
@@ -657,23 +870,21 @@ class Utilities(Processor):
         # Return if no val found for Slack webhook
         if self.slack_channel is None:
             return False
+        # Nothing to post — skip the webhook round-trip entirely
+        if not (text_header or text_payload):
+            return False
+
+        # Look up alert color by status; default gray for unknown statuses
+        # (previously an unrecognized status hit an UnboundLocalError)
+        color = _SLACK_COLORS.get(status, "808080")
 
-        if status == "SUCCESS":
-            # Set alert color to green
-            color = "00FF00"
-        elif status == "WARNING":
-            # Set alert color to orange
-            color = "E8793B"
-        elif status == "ERROR":
-            # Set alert color to red
-            color = "FF0000"
-
-        slack_payload = f'payload={{"attachments":[{{"color":"{color}", "title": "{status}: {text_header}", "text": "{text_payload}"'
+        # Build the attachment as a dict and let json.dumps handle escaping
+        # (manual f-string assembly broke on quotes/newlines in payload text)
+        attachment = {"color": color, "title": f"{status}: {text_header}", "text": text_payload}
         if title_link:
-            title_link = self._ensure_https(title_link)
-            slack_payload = slack_payload + f', "title_link":"{title_link}"'
-        slack_payload = slack_payload + "}]}"
-        status_code, response = self._curl_cmd_exec(method="POST", url=self.slack_channel, data=slack_payload)
+            attachment["title_link"] = self._ensure_https(title_link)
+        slack_payload = json.dumps({"attachments": [attachment]})
+        status_code, response = self._curl_cmd_exec(method="POST", url=self.slack_channel, data={"payload": slack_payload})
         if status_code <= 204:
             self.output("Successfully posted message to Slack channel")
         else: